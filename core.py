@@ -1,11 +1,16 @@
+import copy
+import functools
 import json
 import logging
 import os
+import queue
+import re
 import sys
 import threading
 import time
-from datetime import datetime
+from urllib.parse import urljoin
 
+import requests
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -13,8 +18,10 @@ from selenium.webdriver.common.by import By
 from selenium.common.exceptions import (
     SessionNotCreatedException,
     NoSuchElementException,
+    TimeoutException,
 )
-from selenium.webdriver.support.ui import Select
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
 
 
 logger = logging.getLogger("SUDA-Net-Daemon")
@@ -45,6 +52,11 @@ def setup_logging():
         logger.warning(f"无法创建日志文件: {e}")
 
 
+_TS_FMT = "%d/%m/%Y %H:%M:%S"
+
+SUCCESS_MSG = "您已经成功登录。"
+
+
 DEFAULT_CONFIG = {
     "login": {
         "account": "",
@@ -62,6 +74,13 @@ DEFAULT_CONFIG = {
 }
 
 
+@functools.lru_cache(maxsize=8)
+def _parse_cached(path, stat_key):
+    # stat_key 为 (st_mtime_ns, st_size)：文件未变化时直接命中缓存，跳过读盘和解析
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
 def load_config(path="config.json"):
     # 使用程序所在目录的绝对路径
     if not os.path.isabs(path):
@@ -73,8 +92,9 @@ def load_config(path="config.json"):
         path = os.path.join(config_dir, path)
     if not os.path.exists(path):
         return DEFAULT_CONFIG.copy()
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    st = os.stat(path)
+    # 深拷贝后返回，调用方可以继续随意修改而不污染缓存
+    data = copy.deepcopy(_parse_cached(path, (st.st_mtime_ns, st.st_size)))
     cfg = DEFAULT_CONFIG.copy()
     cfg["login"].update(data.get("login", {}))
     cfg["daemon"].update(data.get("daemon", {}))
@@ -94,6 +114,12 @@ def save_config(cfg, path="config.json"):
         path = os.path.join(config_dir, path)
     with open(path, "w", encoding="utf-8") as f:
         json.dump(cfg, f, ensure_ascii=False, indent=2)
+    # 立即按新的 mtime 预热解析缓存，保存后的下一次 load_config 不再解析
+    try:
+        st = os.stat(path)
+        _parse_cached(path, (st.st_mtime_ns, st.st_size))
+    except OSError:
+        pass
 
 
 def validate_config(cfg):
@@ -118,13 +144,64 @@ def validate_config(cfg):
     return len(errors) == 0, "；".join(errors)
 
 
-def _find_first_by_xpath(chrome, xpaths):
+# 登录页各元素的默认候选 XPath，按命中概率从高到低排列
+_DEFAULT_OPERATOR_XPATHS = (
+    '//*[@id="edit_body"]/div[2]/div[12]/select',
+    '//*[@id="edit_body"]//select',
+    "//select",
+)
+_DEFAULT_ACCOUNT_XPATHS = (
+    '//*[@id="edit_body"]/div[2]/div[12]/form/input[3]',
+    '//*[@id="edit_body"]//input[@type="text" or @name="username" or @id="username"]',
+    '//input[@type="text" or @name="username" or @id="username"]',
+)
+_DEFAULT_PASSWORD_XPATHS = (
+    '//*[@id="edit_body"]/div[2]/div[12]/form/input[4]',
+    '//*[@id="edit_body"]//input[@type="password" or @name="password" or @id="password"]',
+    '//input[@type="password" or @name="password" or @id="password"]',
+)
+_DEFAULT_SUBMIT_XPATHS = (
+    '//*[@id="edit_body"]/div[2]/div[12]/form/input[2]',
+    '//*[@id="edit_body"]//input[@type="submit" or @value="登录" or @value="Login"]',
+    '//input[@type="submit" or @value="登录" or @value="Login"]',
+    '//button[contains(.,"登录") or contains(.,"Login")]',
+)
+
+
+def _probe_online(host, timeout=2, session=None):
+    """轻量 HTTP 探测当前是否已登录，无需浏览器导航。
+
+    直接 GET 网关首页并检查成功登录提示。校园网环境下外网探测
+    地址（如 generate_204）即便已登录也常不可达，只会白等超时，
+    网关自身的页面才是可靠且低延迟的信号。传入 session 时复用
+    其长连接，省去每次探测的 TCP 建连。
+    """
+    getter = session.get if session is not None else requests.get
+    try:
+        resp = getter(host, timeout=timeout)
+        return SUCCESS_MSG in resp.text
+    except requests.RequestException:
+        return False
+
+
+def _find_first_by_xpath(chrome, xpaths, role=None):
+    # 记住每类元素上次命中的 XPath，下次优先尝试，避免重复的失配往返
+    winners = getattr(chrome, "_xpath_winners", None)
+    if winners is None:
+        winners = chrome._xpath_winners = {}
+    winner = winners.get(role) if role else None
+    if winner and winner in xpaths:
+        xpaths = (winner,) + tuple(xp for xp in xpaths if xp != winner)
+
     last_exc = None
     for xp in xpaths:
         if not xp:
             continue
         try:
-            return chrome.find_element(By.XPATH, xp)
+            element = chrome.find_element(By.XPATH, xp)
+            if role:
+                winners[role] = xp
+            return element
         except Exception as e:
             last_exc = e
             continue
@@ -133,37 +210,70 @@ def _find_first_by_xpath(chrome, xpaths):
     raise NoSuchElementException("No valid xpath provided")
 
 
+# 一次 JS 调用同时取出成功提示和消息文本，省去两次 WebDriver 往返
+_CHECK_JS = """
+function text(xp) {
+  var node = document.evaluate(
+    xp, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+  ).singleNodeValue;
+  return node ? node.textContent.trim() : null;
+}
+return [text(arguments[0]), text(arguments[1])];
+"""
+
+
 def check(chrome, host):
     chrome.get(host)
 
-    successed = False
     success_info_xpath = '//*[@id="edit_body"]/div/div[1]/form/div[1]'
-
     message_xpath = '//*[@id="message"]'
-    succecc_msg = "您已经成功登录。"
+
     try:
-        successed = (
-            succecc_msg
-            == chrome.find_element(By.XPATH, success_info_xpath).text.strip()
+        success_text, msg = chrome.execute_script(
+            _CHECK_JS, success_info_xpath, message_xpath
         )
-    except NoSuchElementException:
-        pass
+    except Exception:
+        message = "页面状态解析失败。"
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error(message, exc_info=True)
+        return False, message
 
+    # JS 侧已 trim，startswith 判定即可，也兼容提示后附带的其它文本
+    successed = success_text is not None and success_text.startswith("您已经成功登录")
     if successed:
-        message = succecc_msg
+        message = SUCCESS_MSG
+    elif msg:
+        message = msg
     else:
-        try:
-            msg = chrome.find_element(By.XPATH, message_xpath).text
-            message = msg
-        except NoSuchElementException:
-            message = "未登录，尝试登录。"
-        except Exception:
-            message = "页面状态解析失败。"
-            logger.error(message, exc_info=True)
+        message = "未登录，尝试登录。"
     return successed, message
 
 
-def login(chrome, login_cfg=None):
+# 按可见文本选中运营商，一次 JS 调用代替 Select 的多次 option 遍历往返
+_SELECT_OPERATOR_JS = """
+var select = arguments[0], target = arguments[1];
+for (var i = 0; i < select.options.length; i++) {
+  if (select.options[i].text === target) {
+    select.value = select.options[i].value;
+    select.dispatchEvent(new Event('change', {bubbles: true}));
+    break;
+  }
+}
+"""
+
+# 一次 JS 调用完成填表和提交，代替逐元素的 click/clear/send_keys 往返
+_FILL_AND_SUBMIT_JS = """
+var account = arguments[0], password = arguments[1], submit = arguments[2];
+account.value = arguments[3];
+account.dispatchEvent(new Event('input', {bubbles: true}));
+password.value = arguments[4];
+password.dispatchEvent(new Event('input', {bubbles: true}));
+submit.click();
+"""
+
+
+def login(chrome, login_cfg=None, fail_count=0):
+    # fail_count 为本次运行中此前的连续登录失败次数，决定定位失败的日志级别
     login_cfg = login_cfg or {}
     u = login_cfg.get("account", "")
     p = login_cfg.get("password", "")
@@ -175,91 +285,179 @@ def login(chrome, login_cfg=None):
     password_xpath = login_cfg.get("password_xpath")
     submit_xpath = login_cfg.get("submit_xpath")
 
-    default_operator_xpaths = [
-        '//*[@id="edit_body"]/div[2]/div[12]/select',
-        '//*[@id="edit_body"]//select',
-        "//select",
-    ]
-
-    default_account_xpaths = [
-        '//*[@id="edit_body"]/div[2]/div[12]/form/input[3]',
-        '//*[@id="edit_body"]//input[@type="text" or @name="username" or @id="username"]',
-        '//input[@type="text" or @name="username" or @id="username"]',
-    ]
-    default_password_xpaths = [
-        '//*[@id="edit_body"]/div[2]/div[12]/form/input[4]',
-        '//*[@id="edit_body"]//input[@type="password" or @name="password" or @id="password"]',
-        '//input[@type="password" or @name="password" or @id="password"]',
-    ]
-    default_submit_xpaths = [
-        '//*[@id="edit_body"]/div[2]/div[12]/form/input[2]',
-        '//*[@id="edit_body"]//input[@type="submit" or @value="登录" or @value="Login"]',
-        '//input[@type="submit" or @value="登录" or @value="Login"]',
-        '//button[contains(.,"登录") or contains(.,"Login")]',
-    ]
-
     try:
         if operator or operator_xpath:
-            op_xpaths = [operator_xpath] if operator_xpath else default_operator_xpaths
-            dropdown = _find_first_by_xpath(chrome, op_xpaths)
-            select = Select(dropdown)
+            op_xpaths = (
+                (operator_xpath,) if operator_xpath else _DEFAULT_OPERATOR_XPATHS
+            )
+            dropdown = _find_first_by_xpath(chrome, op_xpaths, role="operator")
             if operator:
-                select.select_by_visible_text(operator)
-            time.sleep(0.5)
+                chrome.execute_script(_SELECT_OPERATOR_JS, dropdown, operator)
     except Exception:
-        logger.error(
-            "选择运营商失败，请检查配置中的 operator 或 operator_xpath。", exc_info=True
-        )
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error(
+                "选择运营商失败，请检查配置中的 operator 或 operator_xpath。",
+                exc_info=True,
+            )
         return False
 
     try:
         account_input = _find_first_by_xpath(
-            chrome, [account_xpath] if account_xpath else default_account_xpaths
+            chrome,
+            (account_xpath,) if account_xpath else _DEFAULT_ACCOUNT_XPATHS,
+            role="account",
         )
         password_input = _find_first_by_xpath(
-            chrome, [password_xpath] if password_xpath else default_password_xpaths
+            chrome,
+            (password_xpath,) if password_xpath else _DEFAULT_PASSWORD_XPATHS,
+            role="password",
         )
         login_bt = _find_first_by_xpath(
-            chrome, [submit_xpath] if submit_xpath else default_submit_xpaths
+            chrome,
+            (submit_xpath,) if submit_xpath else _DEFAULT_SUBMIT_XPATHS,
+            role="submit",
         )
 
-        account_input.click()
-        time.sleep(0.5)
-        account_input.clear()
-        account_input.send_keys(u)
-
-        password_input.click()
-        time.sleep(0.5)
-        password_input.clear()
-        password_input.send_keys(p)
-
-        chrome.execute_script("arguments[0].click()", login_bt)
+        wait = WebDriverWait(chrome, 5)
+        wait.until(EC.element_to_be_clickable(account_input))
+        chrome.execute_script(
+            _FILL_AND_SUBMIT_JS, account_input, password_input, login_bt, u, p
+        )
+        # 等待提交后的页面跳转，超时不视为失败，由后续 check 判定
+        try:
+            wait.until(EC.staleness_of(login_bt))
+        except TimeoutException:
+            pass
         return True
     except Exception:
-        logger.error("登录元素定位失败，请检查配置中的 XPath。", exc_info=True)
+        # 首次失败记 ERROR 带堆栈，反复失败只记 DEBUG，避免稳态刷屏和格式化开销
+        if fail_count == 0:
+            logger.error("登录元素定位失败，请检查配置中的 XPath。", exc_info=True)
+        else:
+            logger.debug(f"登录元素定位失败（第 {fail_count + 1} 次）。")
+        return False
+
+
+# 认证页表单解析用的正则，页面很小且结构固定，足够可靠
+_FORM_ACTION_RE = re.compile(r'<form[^>]*\baction=["\']?([^"\'>\s]*)', re.I)
+_INPUT_TAG_RE = re.compile(r"<input[^>]*>", re.I)
+_SELECT_RE = re.compile(
+    r'<select[^>]*\bname=["\']?([^"\'>\s]+)["\']?[^>]*>(.*?)</select>', re.I | re.S
+)
+_OPTION_RE = re.compile(
+    r'<option[^>]*\bvalue=["\']?([^"\'>\s]*)["\']?[^>]*>([^<]*)', re.I
+)
+_ATTR_RE = re.compile(r'(\w+)\s*=\s*("([^"]*)"|\'([^\']*)\'|[^\s>]+)')
+
+
+def _tag_attrs(tag):
+    attrs = {}
+    for m in _ATTR_RE.finditer(tag):
+        if m.group(3) is not None:
+            value = m.group(3)
+        elif m.group(4) is not None:
+            value = m.group(4)
+        else:
+            value = m.group(2)
+        attrs[m.group(1).lower()] = value
+    return attrs
+
+
+def login_via_http(session, host, login_cfg=None):
+    """尝试用纯 HTTP 表单提交完成登录，成功返回 True。
+
+    适用于标准表单结构的认证页：取第一个文本框填账号、第一个密码框
+    填密码，运营商按下拉框可见文本匹配，隐藏域原样回传。页面结构不
+    匹配或请求失败时返回 False，由调用方回退到 Selenium 流程。
+    """
+    login_cfg = login_cfg or {}
+    try:
+        resp = session.get(host, timeout=5)
+        html = resp.text
+
+        action_match = _FORM_ACTION_RE.search(html)
+        if not action_match:
+            return False
+        action = urljoin(resp.url, action_match.group(1) or resp.url)
+
+        data = {}
+        account_field = password_field = None
+        for tag in _INPUT_TAG_RE.findall(html):
+            attrs = _tag_attrs(tag)
+            name = attrs.get("name")
+            if not name:
+                continue
+            input_type = attrs.get("type", "text").lower()
+            if input_type == "hidden":
+                data[name] = attrs.get("value", "")
+            elif input_type == "text" and account_field is None:
+                account_field = name
+            elif input_type == "password" and password_field is None:
+                password_field = name
+        if not account_field or not password_field:
+            return False
+        data[account_field] = login_cfg.get("account", "")
+        data[password_field] = login_cfg.get("password", "")
+
+        operator = login_cfg.get("operator")
+        select_match = _SELECT_RE.search(html)
+        if operator and select_match:
+            select_name, options_html = select_match.groups()
+            for value, label in _OPTION_RE.findall(options_html):
+                if label.strip() == operator:
+                    data[select_name] = value
+                    break
+
+        resp = session.post(action, data=data, timeout=5)
+        return SUCCESS_MSG in resp.text or _probe_online(host, session=session)
+    except requests.RequestException:
+        logger.warning("HTTP 表单登录请求失败，将回退到浏览器流程。")
         return False
 
 
-def init_chrome(host):
+# 固定调试端口，守护进程重启时直接重连现有 Chrome，免去冷启动
+_DEBUG_ADDRESS = "127.0.0.1:9222"
+
+
+def init_chrome():
+    attach_options = Options()
+    attach_options.add_experimental_option("debuggerAddress", _DEBUG_ADDRESS)
+    try:
+        chrome = webdriver.Chrome(options=attach_options)
+        logger.info(f"已复用调试端口 {_DEBUG_ADDRESS} 上的现有 Chrome 实例。")
+        return chrome
+    except Exception:
+        pass
+
     chrome_options = Options()
+    chrome_options.add_argument(f"--remote-debugging-port={_DEBUG_ADDRESS.split(':')[1]}")
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--incognito")
     chrome_options.add_argument("disable-cache")
     chrome_options.add_argument("log-level=3")
     chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-background-networking")
+    chrome_options.add_argument("--disable-features=TranslateUI")
+    # 认证页只需要 DOM，不必等整页 load，也不必加载图片和样式
+    chrome_options.page_load_strategy = "eager"
+    chrome_options.add_experimental_option(
+        "prefs",
+        {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.stylesheets": 2,
+        },
+    )
 
     try:
-        chrome = webdriver.Chrome(options=chrome_options)
-        chrome.get(host)
-        return chrome
+        return webdriver.Chrome(options=chrome_options)
     except SessionNotCreatedException:
         if os.path.exists("chromedriver.exe"):
             try:
-                chrome = webdriver.Chrome(
+                return webdriver.Chrome(
                     service=Service("chromedriver.exe"), options=chrome_options
                 )
-                chrome.get(host)
-                return chrome
             except SessionNotCreatedException:
                 logger.error(
                     "ChromeDriver 与 Chrome 版本不一致，请更新 chromedriver.exe 或删除它以使用 Selenium Manager 自动匹配。",
@@ -280,12 +478,17 @@ def init_chrome(host):
 
 
 class NetDaemon(threading.Thread):
-    def __init__(self, config, on_status=None):
+    def __init__(self, config):
         super().__init__(daemon=True)
         self.config = config
-        self.on_status = on_status
+        # 状态消息经有界队列交给 UI 侧轮询，慢消费方不会拖慢探测循环
+        self.status_queue = queue.Queue(maxsize=16)
         self._stop_event = threading.Event()
         self.chrome = None
+        self.session = requests.Session()
+        self._consecutive_ok = 0
+        # 本次运行中连续登录失败的次数，登录成功即清零
+        self._login_fail_count = 0
 
     def stop(self):
         """停止守护进程并清理资源"""
@@ -293,55 +496,82 @@ class NetDaemon(threading.Thread):
         self._stop_event.set()
         try:
             if self.chrome:
-                self.chrome.quit()
+                # 只断开 ChromeDriver，保留调试端口上的 Chrome 供下次复用
+                self.chrome.service.stop()
                 self.chrome = None
         except Exception as e:
-            logger.warning(f"关闭浏览器时出错: {e}")
+            logger.warning(f"断开浏览器连接时出错: {e}")
+        try:
+            self.session.close()
+        except Exception as e:
+            logger.warning(f"关闭 HTTP 会话时出错: {e}")
 
     def _emit(self, text):
-        if self.on_status:
-            self.on_status(text)
+        try:
+            self.status_queue.put_nowait(text)
+        except queue.Full:
+            pass  # UI 来不及消费时直接丢弃，不阻塞探测循环
 
     def run(self):
         host = self.config["daemon"]["host"]
         delay = int(self.config["daemon"]["frequencies"])
         login_cfg = self.config.get("login", {})
 
-        self._emit("正在初始化浏览器...")
-        self.chrome = init_chrome(host)
-        if not self.chrome:
-            self._emit("浏览器初始化失败")
-            return
-        self._emit("初始化完成，开始后台监控网络连接...")
+        self._emit("开始后台监控网络连接...")
 
         while not self._stop_event.is_set():
             try:
-                s, m = check(self.chrome, host)
-                dt = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+                # 稳态只做一次轻量 HTTP 探测，避免每个周期都整页导航
+                if _probe_online(host, session=self.session):
+                    s, m = True, "网络连接正常。"
+                elif login_via_http(self.session, host, login_cfg):
+                    # 纯 HTTP 表单登录成功时全程不需要浏览器
+                    s, m = True, "已通过 HTTP 表单重新登录。"
+                else:
+                    # 探测失败才按需启动浏览器，已联网时完全不占用 Chrome
+                    if not self.chrome:
+                        self._emit("检测到未联网，正在初始化浏览器...")
+                        self.chrome = init_chrome()
+                        if not self.chrome:
+                            self._emit("浏览器初始化失败，30秒后重试...")
+                            if self._stop_event.wait(30):
+                                return
+                            continue
+                    s, m = check(self.chrome, host)
+                # 每轮只格式化一次时间戳，重试登录后再刷新
+                dt = time.strftime(_TS_FMT)
 
                 if not s:
                     self._emit(f"[{dt}] 状态：{m} 尝试登录...")
-                    ok = login(self.chrome, login_cfg)
+                    ok = login(
+                        self.chrome, login_cfg, fail_count=self._login_fail_count
+                    )
                     if not ok:
+                        self._login_fail_count += 1
                         logger.error("登录流程失败，稍后重试。")
-                    time.sleep(3)
                     s, m = check(self.chrome, host)
-                    dt = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+                    dt = time.strftime(_TS_FMT)
 
                 if s:
+                    self._login_fail_count = 0
                     msg = f"已成功登录。[{dt}]"
                 else:
                     msg = f"尝试登录后仍未登录。[{dt}]"
                 self._emit(msg)
 
-                for _ in range(delay):
-                    if self._stop_event.is_set():
-                        break
-                    time.sleep(1)
+                # 连续在线时指数退避探测间隔，最长为基础间隔的 60 倍
+                if s:
+                    wait = min(delay * (2 ** min(self._consecutive_ok, 6)), delay * 60)
+                    self._consecutive_ok += 1
+                else:
+                    wait = delay
+                    self._consecutive_ok = 0
+
+                # 一次内核等待即可，stop() 触发时立即返回
+                if self._stop_event.wait(wait):
+                    break
             except Exception as e:
                 logger.error(f"主循环发生严重错误: {e}", exc_info=True)
                 self._emit("主循环错误，30秒后重试...")
-                for _ in range(30):
-                    if self._stop_event.is_set():
-                        break
-                    time.sleep(1)
+                if self._stop_event.wait(30):
+                    break
@@ -1,14 +1,21 @@
+import concurrent.futures
+import json
 import os
+import queue
 import sys
+import tempfile
 import threading
+import time
+from collections import deque
+from pathlib import Path
 from typing import Any, cast
 import tkinter as tk
 from tkinter import ttk, messagebox
-from tkinter.scrolledtext import ScrolledText
-import pystray
-from PIL import Image, ImageDraw, ImageTk
+from PIL import Image
 
 try:
+    import pywintypes  # type: ignore
+    import win32con  # type: ignore
     import win32event  # type: ignore
     import win32api  # type: ignore
     import winerror  # type: ignore
@@ -20,8 +27,55 @@ except ImportError:
 from core import NetDaemon, load_config, save_config, setup_logging, validate_config
 
 APP_NAME = "苏州大学网关自动登录工具"
-ICON_PATH = os.path.join(os.path.dirname(__file__), "resources", "suda-logo.png")
+ICON_PATH = Path(__file__).parent / "resources" / "suda-logo.png"
+# 图标文件是否存在只在导入时 stat 一次
+_ICON_EXISTS = ICON_PATH.is_file()
 MUTEX_UI = "Local\\SUDA_Net_Daemon_UI_Mutex"
+_OPERATORS = ("校园网", "中国电信", "中国移动", "中国联通")
+
+# 反复弹出的提示文案在导入时拼好，点击路径上不再重复构造字符串
+MSG_ALREADY_RUNNING = "守护进程已经在运行中"
+MSG_NOT_RUNNING = "守护进程未运行"
+MSG_CONFIG_SAVED = "配置已成功保存到 config.json"
+MSG_INSTANCE_RUNNING = f"{APP_NAME}已经在运行中！\n\n请检查系统托盘图标。"
+
+
+class TrimmedVar(tk.StringVar):
+    """get() 返回去除首尾空白的值，写入前一直复用缓存结果"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached = None
+        self.trace_add("write", self._invalidate)
+
+    def _invalidate(self, *_args):
+        self._cached = None
+
+    def get(self):
+        if self._cached is None:
+            self._cached = super().get().strip()
+        return self._cached
+
+
+class _NullDaemon:
+    """始终"未运行"的空对象，代替 None 省去各处判空和竞态"""
+
+    status_queue = queue.Queue()
+
+    @staticmethod
+    def is_alive():
+        return False
+
+    @staticmethod
+    def stop():
+        pass
+
+    @staticmethod
+    def join(timeout=None):
+        pass
+
+
+_NULL_DAEMON = _NullDaemon()
 
 
 def ensure_single_instance(mutex_name: str, show_message: bool = True):
@@ -29,15 +83,23 @@ def ensure_single_instance(mutex_name: str, show_message: bool = True):
     if not HAS_WIN32:
         return None
 
+    # 快路径：已有实例时 OpenMutex 直接命中，省去带属主创建再查错误码
+    try:
+        existing = win32event.OpenMutex(win32con.SYNCHRONIZE, False, mutex_name)  # type: ignore
+        win32api.CloseHandle(existing)  # type: ignore
+        if show_message:
+            messagebox.showerror("程序已运行", MSG_INSTANCE_RUNNING)
+        return None
+    except pywintypes.error:  # type: ignore
+        pass  # 不存在则继续创建
+
     try:
         # CreateMutex的第一个参数应该省略，让其使用默认安全描述符
-        mutex = win32event.CreateMutex(None, 1, mutex_name)  # type: ignore
-        last_error = win32api.GetLastError()
-        if last_error == winerror.ERROR_ALREADY_EXISTS:
+        mutex = win32event.CreateMutex(None, 0, mutex_name)  # type: ignore
+        # OpenMutex 和 CreateMutex 之间仍可能被抢先创建，保留兜底检查
+        if win32api.GetLastError() == winerror.ERROR_ALREADY_EXISTS:
             if show_message:
-                messagebox.showerror(
-                    "程序已运行", f"{APP_NAME}已经在运行中！\n\n请检查系统托盘图标。"
-                )
+                messagebox.showerror("程序已运行", MSG_INSTANCE_RUNNING)
             return None
         return mutex
     except Exception as e:
@@ -45,15 +107,67 @@ def ensure_single_instance(mutex_name: str, show_message: bool = True):
         return None
 
 
-def create_tray_icon(on_open, on_exit):
-    if os.path.exists(ICON_PATH):
-        image = Image.open(ICON_PATH).convert("RGBA")
-        image = image.resize((64, 64))
-    else:
+def _tray_cache_path():
+    base = os.environ.get("LOCALAPPDATA") or tempfile.gettempdir()
+    return os.path.join(base, "suda_tray_64.raw")
+
+
+def _load_tray_image():
+    if not _ICON_EXISTS:
+        # 只有缺图标时才需要绘制回退图，ImageDraw 按需加载
+        from PIL import ImageDraw
+
         image = Image.new("RGB", (64, 64), color=(30, 136, 229))
         draw = ImageDraw.Draw(image)
         draw.ellipse((12, 12, 52, 52), fill=(255, 255, 255))
         draw.text((22, 20), "S", fill=(30, 136, 229))
+        return image
+
+    # 磁盘缓存已缩放的 64x64 RGBA 像素，后续启动跳过 PNG 解码
+    cache_path = _tray_cache_path()
+    try:
+        if os.path.getmtime(cache_path) >= ICON_PATH.stat().st_mtime:
+            with open(cache_path, "rb") as f:
+                data = f.read()
+            if len(data) == 64 * 64 * 4:
+                return Image.frombytes("RGBA", (64, 64), data)
+    except OSError:
+        pass
+
+    image = Image.open(ICON_PATH).convert("RGBA").resize((64, 64))
+    try:
+        with open(cache_path, "wb") as f:
+            f.write(image.tobytes())
+    except OSError:
+        pass
+    return image
+
+
+# 进程内图标单例：托盘和窗口图标共用同一次解码（含回退绘制）
+_ICON_CACHE = {}
+
+
+def _get_tray_image():
+    image = _ICON_CACHE.get("tray")
+    if image is None:
+        image = _ICON_CACHE["tray"] = _load_tray_image()
+    return image
+
+
+def _get_window_photo(root):
+    photo = _ICON_CACHE.get("window")
+    if photo is None:
+        from PIL import ImageTk
+
+        photo = _ICON_CACHE["window"] = ImageTk.PhotoImage(
+            _get_tray_image(), master=root
+        )
+    return photo
+
+
+def create_tray_icon(image, on_open, on_exit):
+    # pystray 会拉起一批 Windows COM 依赖，推迟到真正建托盘时再导入
+    import pystray
 
     menu = pystray.Menu(
         pystray.MenuItem("打开", on_open, default=True),
@@ -68,6 +182,17 @@ def create_tray_icon(on_open, on_exit):
 
 
 class App:
+    # 配置键与对应 StringVar 属性名的映射，驱动 _build_config
+    _LOGIN_FIELDS = (
+        ("account", "account_var"),
+        ("password", "password_var"),
+        ("operator", "operator_var"),
+        ("operator_xpath", "operator_xpath_var"),
+        ("account_xpath", "account_xpath_var"),
+        ("password_xpath", "password_xpath_var"),
+        ("submit_xpath", "submit_xpath_var"),
+    )
+
     def __init__(self, root):
         self.root = root
         self.root.title(APP_NAME)
@@ -77,72 +202,121 @@ class App:
         # 注册退出清理
         import atexit
 
-        atexit.register(self._safe_cleanup)
+        self._shutdown_done = False
+        atexit.register(self._shutdown)
         self._set_window_icon()
         self._init_style()
 
-        self.daemon = None
+        self.daemon = _NULL_DAEMON
         self.tray_icon = None
         self._tray_thread = None
         self.config = {}  # 初始化配置字典
+        self._last_saved_key = None  # 上次落盘配置的序列化指纹
+        self._starting = False  # 守护进程是否正在后台启动
+        self._hide_after_start = False  # 本次启动成功后是否最小化到托盘
+        # 单线程工作队列：串行执行启动/停止等阻塞操作，不占用 Tk 主循环
+        self._worker = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+        # 托盘图标的 PNG 解码放到后台线程，不挡首帧绘制
+        self._tray_image = None
+        self._tray_image_ready = threading.Event()
+        threading.Thread(target=self._prepare_tray_image, daemon=True).start()
 
         self.status_var = tk.StringVar(value="未启动")
-        self._log_lines = 0
         self._log_limit = 500
+        # 最近一条状态及其时间，用于过滤稳态下的重复消息
+        self._last_status = ""
+        self._last_status_ts = 0.0
 
         self._build_ui()
         self._load_config()
 
-        # 立即创建托盘图标（常驻）
-        self.root.after(100, self._create_persistent_tray)
+        # 轮询守护线程的状态队列
+        self.root.after(100, self._drain_status)
 
-        # 自动启动网络连接（延迟2秒，确保界面加载完成）
-        self.root.after(2000, self._auto_start_network)
+        # 窗口首次映射后再建托盘并自动联网，省掉启动期的多个定时器
+        self._mapped_once = False
+        self.root.bind("<Map>", self._on_first_map, add="+")
+
+    def _on_first_map(self, _event=None):
+        if self._mapped_once:
+            return
+        self._mapped_once = True
+        self._create_persistent_tray()
+        self.root.after_idle(self._auto_start_network)
 
     def _build_ui(self):
         main = ttk.Frame(self.root, padding=10)
         main.pack(fill=tk.BOTH, expand=True)
 
-        notebook = ttk.Notebook(main)
-        notebook.pack(fill=tk.BOTH, expand=True, pady=(4, 0))
-
-        basic_tab = ttk.Frame(notebook, padding=12)
-        advanced_tab = ttk.Frame(notebook, padding=12)
-        logs_tab = ttk.Frame(notebook, padding=12)
-        about_tab = ttk.Frame(notebook, padding=12)
-        notebook.add(basic_tab, text="基础设置")
-        notebook.add(advanced_tab, text="高级设置")
-        notebook.add(logs_tab, text="日志")
-        notebook.add(about_tab, text="关于")
-
+        self.notebook = ttk.Notebook(main)
+        self.notebook.pack(fill=tk.BOTH, expand=True, pady=(4, 0))
+
+        self._basic_tab = ttk.Frame(self.notebook, padding=12)
+        self._advanced_tab = ttk.Frame(self.notebook, padding=12)
+        self._logs_tab = ttk.Frame(self.notebook, padding=12)
+        self._about_tab = ttk.Frame(self.notebook, padding=12)
+        self.notebook.add(self._basic_tab, text="基础设置")
+        self.notebook.add(self._advanced_tab, text="高级设置")
+        self.notebook.add(self._logs_tab, text="日志")
+        self.notebook.add(self._about_tab, text="关于")
+
+        # 绑定变量先全部建好，配置读写不依赖页签是否已构建
+        self.operator_xpath_var = TrimmedVar()
+        self.account_xpath_var = TrimmedVar()
+        self.password_xpath_var = TrimmedVar()
+        self.submit_xpath_var = TrimmedVar()
+
+        # 日志页签未构建时先积压日志，构建后一次性回放
+        self.log_list = None
+        self._pending_logs = deque(maxlen=self._log_limit)
+
+        # 只构建首屏可见的基础页签，其余在首次切换时再建
+        self._built_tabs = {str(self._basic_tab)}
+        self._build_basic_tab(self._basic_tab)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+
+    def _on_tab_changed(self, _event=None):
+        tab_name = self.notebook.select()
+        if tab_name in self._built_tabs:
+            return
+        self._built_tabs.add(tab_name)
+        if tab_name == str(self._advanced_tab):
+            self._build_advanced_tab(self._advanced_tab)
+        elif tab_name == str(self._logs_tab):
+            self._build_logs_tab(self._logs_tab)
+        elif tab_name == str(self._about_tab):
+            self._build_about_tab(self._about_tab)
+
+    def _build_basic_tab(self, basic_tab):
         row = 0
         ttk.Label(basic_tab, text="网关地址").grid(row=row, column=0, sticky=tk.W)
-        self.host_var = tk.StringVar()
+        self.host_var = TrimmedVar()
         ttk.Entry(basic_tab, textvariable=self.host_var, width=50).grid(
             row=row, column=1, columnspan=2, sticky=tk.EW, padx=(8, 0)
         )
 
         row += 1
         ttk.Label(basic_tab, text="账号").grid(row=row, column=0, sticky=tk.W)
-        self.account_var = tk.StringVar()
+        self.account_var = TrimmedVar()
         ttk.Entry(basic_tab, textvariable=self.account_var, width=30).grid(
             row=row, column=1, sticky=tk.W, padx=(8, 0)
         )
 
         row += 1
         ttk.Label(basic_tab, text="密码").grid(row=row, column=0, sticky=tk.W)
-        self.password_var = tk.StringVar()
+        self.password_var = TrimmedVar()
         ttk.Entry(basic_tab, textvariable=self.password_var, width=30, show="*").grid(
             row=row, column=1, sticky=tk.W, padx=(8, 0)
         )
 
         row += 1
         ttk.Label(basic_tab, text="运营商").grid(row=row, column=0, sticky=tk.W)
-        self.operator_var = tk.StringVar()
+        self.operator_var = TrimmedVar()
         self.operator_combo = ttk.Combobox(
             basic_tab,
             textvariable=self.operator_var,
-            values=["校园网", "中国电信", "中国移动", "中国联通"],
+            values=_OPERATORS,
             state="readonly",
             width=28,
         )
@@ -150,46 +324,17 @@ class App:
 
         row += 1
         ttk.Label(basic_tab, text="检测间隔(秒)").grid(row=row, column=0, sticky=tk.W)
-        self.freq_var = tk.StringVar()
-        ttk.Entry(basic_tab, textvariable=self.freq_var, width=10).grid(
-            row=row, column=1, sticky=tk.W, padx=(8, 0)
-        )
-
-        row += 1
-        ttk.Label(advanced_tab, text="运营商 XPath(可选)").grid(
-            row=row, column=0, sticky=tk.W
-        )
-        self.operator_xpath_var = tk.StringVar()
-        ttk.Entry(advanced_tab, textvariable=self.operator_xpath_var, width=60).grid(
-            row=row, column=1, columnspan=2, sticky=tk.EW, padx=(8, 0)
-        )
-
-        row += 1
-        ttk.Label(advanced_tab, text="账号 XPath(可选)").grid(
-            row=row, column=0, sticky=tk.W
-        )
-        self.account_xpath_var = tk.StringVar()
-        ttk.Entry(advanced_tab, textvariable=self.account_xpath_var, width=60).grid(
-            row=row, column=1, columnspan=2, sticky=tk.EW, padx=(8, 0)
-        )
-
-        row += 1
-        ttk.Label(advanced_tab, text="密码 XPath(可选)").grid(
-            row=row, column=0, sticky=tk.W
-        )
-        self.password_xpath_var = tk.StringVar()
-        ttk.Entry(advanced_tab, textvariable=self.password_xpath_var, width=60).grid(
-            row=row, column=1, columnspan=2, sticky=tk.EW, padx=(8, 0)
-        )
-
-        row += 1
-        ttk.Label(advanced_tab, text="登录按钮 XPath(可选)").grid(
-            row=row, column=0, sticky=tk.W
-        )
-        self.submit_xpath_var = tk.StringVar()
-        ttk.Entry(advanced_tab, textvariable=self.submit_xpath_var, width=60).grid(
-            row=row, column=1, columnspan=2, sticky=tk.EW, padx=(8, 0)
-        )
+        # IntVar + 键入校验的 Spinbox，读取时拿到的直接就是整数
+        self.freq_var = tk.IntVar(value=10)
+        ttk.Spinbox(
+            basic_tab,
+            from_=5,
+            to=3600,
+            textvariable=self.freq_var,
+            width=10,
+            validate="key",
+            validatecommand=(self.root.register(str.isdigit), "%P"),
+        ).grid(row=row, column=1, sticky=tk.W, padx=(8, 0))
 
         row += 1
         btn_frame = ttk.Frame(basic_tab)
@@ -210,20 +355,48 @@ class App:
             row=row, column=1, columnspan=2, sticky=tk.W
         )
 
+        basic_tab.columnconfigure(1, weight=1)
+
+    def _build_advanced_tab(self, advanced_tab):
+        fields = (
+            ("运营商 XPath(可选)", self.operator_xpath_var),
+            ("账号 XPath(可选)", self.account_xpath_var),
+            ("密码 XPath(可选)", self.password_xpath_var),
+            ("登录按钮 XPath(可选)", self.submit_xpath_var),
+        )
+        for row, (label, var) in enumerate(fields):
+            ttk.Label(advanced_tab, text=label).grid(row=row, column=0, sticky=tk.W)
+            ttk.Entry(advanced_tab, textvariable=var, width=60).grid(
+                row=row, column=1, columnspan=2, sticky=tk.EW, padx=(8, 0)
+            )
+
+        advanced_tab.columnconfigure(1, weight=1)
+
+    def _build_logs_tab(self, logs_tab):
         ttk.Label(logs_tab, text="日志").grid(row=0, column=0, sticky=tk.W, pady=(0, 6))
-        self.log_text = ScrolledText(logs_tab, height=16, wrap=tk.WORD)
-        self.log_text.grid(row=1, column=0, columnspan=3, sticky=tk.NSEW)
-        self.log_text.configure(state=tk.DISABLED)
+        # Listbox 按行渲染、无折行重排，长日志下比 Text 轻得多
+        self.log_list = tk.Listbox(logs_tab, height=16, activestyle="none")
+        scrollbar = ttk.Scrollbar(
+            logs_tab, orient=tk.VERTICAL, command=self.log_list.yview
+        )
+        self.log_list.configure(yscrollcommand=scrollbar.set)
+        self.log_list.grid(row=1, column=0, columnspan=2, sticky=tk.NSEW)
+        scrollbar.grid(row=1, column=2, sticky=tk.NS)
 
         ttk.Button(logs_tab, text="清空日志", command=self.clear_log).grid(
             row=2, column=0, sticky=tk.W, pady=8
         )
 
-        basic_tab.columnconfigure(1, weight=1)
-        advanced_tab.columnconfigure(1, weight=1)
         logs_tab.columnconfigure(0, weight=1)
         logs_tab.rowconfigure(1, weight=1)
 
+        # 回放页签构建前积压的日志
+        if self._pending_logs:
+            pending = tuple(self._pending_logs)
+            self._pending_logs.clear()
+            self.append_log_batch(pending)
+
+    def _build_about_tab(self, about_tab):
         about_title = ttk.Label(about_tab, text="关于", style="Title.TLabel")
         about_title.pack(anchor=tk.W)
         about_text = (
@@ -242,24 +415,25 @@ class App:
 
     def _init_style(self):
         style = ttk.Style(self.root)
-        for theme in ("vista", "xpnative", "clam", "default"):
-            try:
-                style.theme_use(theme)
-                break
-            except Exception:
-                continue
+        # 主题由平台决定，一次选中即可，不必逐个试错捕获异常
+        theme = {"win32": "vista", "darwin": "aqua"}.get(sys.platform, "clam")
+        if theme in style.theme_names():
+            style.theme_use(theme)
         bg = "#FFFFFF"
-        style.configure(".", background=bg)
-        style.configure("TFrame", background=bg)
-        style.configure("TLabel", background=bg)
-        style.configure("TCheckbutton", background=bg)
-        style.configure("TNotebook", background=bg)
-        style.configure("TNotebook.Tab", padding=(10, 4))
-        style.map("TNotebook.Tab", background=[("selected", bg)])
-        style.configure("TEntry", fieldbackground=bg)
-        style.configure("TCombobox", fieldbackground=bg)
-        style.configure("Title.TLabel", font=("Segoe UI", 12, "bold"))
-        style.configure("Body.TLabel", font=("Segoe UI", 10))
+        # 一次 Tcl eval 批量下发样式，免去十余次 Python-Tcl 边界往返
+        self.root.tk.eval(
+            f"ttk::style configure . -background {bg};"
+            f"ttk::style configure TFrame -background {bg};"
+            f"ttk::style configure TLabel -background {bg};"
+            f"ttk::style configure TCheckbutton -background {bg};"
+            f"ttk::style configure TNotebook -background {bg};"
+            "ttk::style configure TNotebook.Tab -padding {10 4};"
+            f"ttk::style map TNotebook.Tab -background [list selected {bg}];"
+            f"ttk::style configure TEntry -fieldbackground {bg};"
+            f"ttk::style configure TCombobox -fieldbackground {bg};"
+            "ttk::style configure Title.TLabel -font {{Segoe UI} 12 bold};"
+            "ttk::style configure Body.TLabel -font {{Segoe UI} 10}"
+        )
         try:
             self.root.configure(bg=bg)
         except Exception:
@@ -267,43 +441,67 @@ class App:
 
     def _load_config(self):
         self.config = load_config("config.json")
-        self.host_var.set(self.config["daemon"]["host"])
-        self.freq_var.set(str(self.config["daemon"]["frequencies"]))
+        self._last_saved_key = json.dumps(self.config, sort_keys=True)
+        daemon_cfg = self.config["daemon"]
+        self.host_var.set(daemon_cfg["host"])
+        # 手改配置里的非法值不应让窗口起不来，回退到默认间隔
+        try:
+            self.freq_var.set(int(daemon_cfg["frequencies"]))
+        except (ValueError, TypeError):
+            self.freq_var.set(10)
 
+        # 与 _build_config 共用同一张字段表
         login = self.config.get("login", {})
-        self.account_var.set(login.get("account", ""))
-        self.password_var.set(login.get("password", ""))
-        self.operator_var.set(login.get("operator", ""))
-        self.operator_xpath_var.set(login.get("operator_xpath", ""))
-        self.account_xpath_var.set(login.get("account_xpath", ""))
-        self.password_xpath_var.set(login.get("password_xpath", ""))
-        self.submit_xpath_var.set(login.get("submit_xpath", ""))
+        for key, attr in self._LOGIN_FIELDS:
+            getattr(self, attr).set(login.get(key, ""))
+
+    def _prepare_tray_image(self):
+        """后台线程中解码并缩放托盘图标"""
+        try:
+            self._tray_image = _get_tray_image()
+        finally:
+            self._tray_image_ready.set()
 
     def _create_persistent_tray(self):
-        """创建常驻托盘图标"""
+        """创建常驻托盘图标（等待后台线程备好图像）"""
         if self.tray_icon:
             return
+        if not self._tray_image_ready.is_set():
+            self.root.after(50, self._create_persistent_tray)
+            return
 
         def on_open(icon, _item=None):
-            # 不停止托盘图标，只显示窗口
-            self.root.after(0, self.show_window)
+            # 不停止托盘图标，只显示窗口；idle 优先级即可，和其它空闲任务合并
+            self.root.after_idle(self.show_window)
 
         def on_exit(icon, _item=None):
             # 退出时停止托盘图标
             icon.stop()
-            self.root.after(0, self._cleanup_and_exit)
-
-        self.tray_icon = create_tray_icon(on_open, on_exit)
-        self._tray_thread = threading.Thread(target=self.tray_icon.run, daemon=True)
-        self._tray_thread.start()
-
-    def _safe_cleanup(self):
-        """安全清理，用于程序异常退出时的保护"""
+            self.root.after_idle(self._cleanup_and_exit)
+
+        image = self._tray_image or _get_tray_image()
+        self.tray_icon = create_tray_icon(image, on_open, on_exit)
+        if HAS_WIN32:
+            # Windows 下 pystray 支持非阻塞运行，省掉专用托盘线程
+            self.tray_icon.run_detached()
+        else:
+            self._tray_thread = threading.Thread(
+                target=self.tray_icon.run, daemon=True
+            )
+            self._tray_thread.start()
+
+    def _shutdown(self):
+        """幂等的统一清理：停守护线程、停托盘，只会执行一次"""
+        if self._shutdown_done:
+            return
+        self._shutdown_done = True
         try:
-            if self.daemon and self.daemon.is_alive():
+            if self.daemon.is_alive():
                 self.daemon.stop()
-        except Exception:
-            pass
+                # 等待线程结束，最多等待3秒
+                self.daemon.join(timeout=3)
+        except Exception as e:
+            print(f"清理资源时出错: {e}")
         try:
             if self.tray_icon:
                 self.tray_icon.stop()
@@ -314,47 +512,33 @@ class App:
         """自动启动网络连接"""
         try:
             # 检查是否已经在运行
-            if self.daemon and self.daemon.is_alive():
+            if self.daemon.is_alive():
                 self.append_log("守护进程已在运行")
                 return
 
             # 检查账号是否配置
-            if not self.account_var.get().strip():
+            if not self.account_var.get():
                 self.append_log("提示：请先配置账号信息后再启动")
                 return
 
-            # 自动启动
+            # 自动启动；启动在工作线程完成，成功后由回调最小化到托盘
+            self._hide_after_start = True
             self.append_log("正在自动连接网络...")
             self.start()
-
-            # 如果启动成功，最小化到托盘
-            if self.daemon and self.daemon.is_alive():
-                self.root.after(1000, self.hide_to_tray)
         except Exception as e:
             self.append_log(f"自动启动失败: {e}")
 
     def _build_config(self):
-        # 验证并获取检测频率，确保在5-3600秒范围内
-        freq = 10  # 默认值
-        try:
-            freq_str = self.freq_var.get().strip()
-            if freq_str:
-                freq = max(5, min(3600, int(freq_str)))  # 限制在5-3600范围内
-        except (ValueError, TypeError):
-            pass  # 使用默认值10
+        # Spinbox 已保证输入为数字，这里只需夹紧到5-3600范围
+        freq = max(5, min(3600, self.freq_var.get()))
 
         return {
             "login": {
-                "account": self.account_var.get().strip(),
-                "password": self.password_var.get().strip(),
-                "operator": self.operator_var.get().strip(),
-                "operator_xpath": self.operator_xpath_var.get().strip(),
-                "account_xpath": self.account_xpath_var.get().strip(),
-                "password_xpath": self.password_xpath_var.get().strip(),
-                "submit_xpath": self.submit_xpath_var.get().strip(),
+                key: getattr(self, attr).get()
+                for key, attr in self._LOGIN_FIELDS
             },
             "daemon": {
-                "host": self.host_var.get().strip(),
+                "host": self.host_var.get(),
                 "frequencies": freq,
             },
         }
@@ -362,6 +546,11 @@ class App:
     def save(self):
         try:
             cfg = self._build_config()
+            # 内容没变就跳过校验和写盘
+            key = json.dumps(cfg, sort_keys=True)
+            if key == self._last_saved_key:
+                self._set_status("配置未变化")
+                return
             # 先验证配置
             valid, error_msg = validate_config(cfg)
             if not valid:
@@ -372,17 +561,19 @@ class App:
             save_config(cfg, "config.json")
             # 更新内存中的配置，保持一致性
             self.config = cfg
+            self._last_saved_key = key
             self._set_status("配置已保存")
-            messagebox.showinfo("成功", "配置已成功保存到 config.json")
+            messagebox.showinfo("成功", MSG_CONFIG_SAVED)
         except Exception as e:
             messagebox.showerror("错误", f"保存配置失败: {e}")
             self._set_status("保存失败")
 
     def start(self):
         # 检查是否已经在运行
-        if self.daemon and self.daemon.is_alive():
+        if self._starting or self.daemon.is_alive():
+            self._hide_after_start = False
             self._set_status("已在运行")
-            messagebox.showinfo("提示", "守护进程已经在运行中")
+            messagebox.showinfo("提示", MSG_ALREADY_RUNNING)
             return
 
         cfg = self._build_config()
@@ -390,47 +581,116 @@ class App:
         # 验证配置
         valid, error_msg = validate_config(cfg)
         if not valid:
+            self._hide_after_start = False
             messagebox.showerror("配置错误", f"配置验证失败：\n{error_msg}")
             self._set_status("配置错误")
             return
 
+        # 构造和启动交给工作线程，不阻塞界面首帧与按钮响应
+        self._starting = True
+        self._worker.submit(self._start_daemon_bg, cfg)
+        self._set_status("启动中...")
+
+    def _start_daemon_bg(self, cfg):
+        """后台线程中构造并启动守护进程，结果经 after 回到主线程"""
         try:
-            self.daemon = NetDaemon(cfg, on_status=self.handle_status)
-            self.daemon.start()
-            self._set_status("启动中...")
+            daemon = NetDaemon(cfg)
+            self.daemon = daemon
+            daemon.start()
+            self.root.after(0, self._on_daemon_started)
         except Exception as e:
-            messagebox.showerror("启动失败", f"无法启动守护进程：{e}")
-            self._set_status("启动失败")
-            self.daemon = None
+            self.daemon = _NULL_DAEMON
+            self._hide_after_start = False
+            self.root.after(0, self._set_status, "启动失败")
+            self.root.after(
+                0, messagebox.showerror, "启动失败", f"无法启动守护进程：{e}"
+            )
+        finally:
+            self._starting = False
+
+    def _on_daemon_started(self):
+        """守护进程启动成功后回到主线程执行的收尾"""
+        if self._hide_after_start:
+            self._hide_after_start = False
+            self.root.after(1000, self.hide_to_tray)
 
     def stop(self):
-        if not self.daemon:
+        if self._starting:
+            # 启动还在工作线程里排队/执行，停止任务排到它后面即可正确收尾
+            self._hide_after_start = False
+            self._set_status("正在停止...")
+            self._worker.submit(self._stop_pending_bg)
+            return
+
+        if self.daemon is _NULL_DAEMON:
             self._set_status("未运行")
-            messagebox.showinfo("提示", "守护进程未运行")
+            messagebox.showinfo("提示", MSG_NOT_RUNNING)
+            return
+
+        # stop/join 阻塞数秒，放到工作线程里做
+        daemon, self.daemon = self.daemon, _NULL_DAEMON
+        self._set_status("正在停止...")
+        self._worker.submit(self._stop_daemon_bg, daemon)
+
+    def _stop_pending_bg(self):
+        """串行排在启动任务之后：取走刚启动完的守护进程并停止"""
+        daemon, self.daemon = self.daemon, _NULL_DAEMON
+        if daemon is _NULL_DAEMON:
+            # 启动最终失败，没有需要停止的进程
+            self.root.after(0, self._set_status, "已停止")
             return
+        self._stop_daemon_bg(daemon)
 
+    def _stop_daemon_bg(self, daemon):
+        """工作线程中停止守护进程并等待其退出"""
         try:
-            if self.daemon.is_alive():
-                self._set_status("正在停止...")
-                self.daemon.stop()
-                self.daemon.join(timeout=2)
-            self.daemon = None
-            self._set_status("已停止")
+            if daemon.is_alive():
+                daemon.stop()
+                daemon.join(timeout=2)
+            self.root.after(0, self._set_status, "已停止")
         except Exception as e:
-            messagebox.showerror("停止失败", f"停止守护进程时出错：{e}")
-            self.daemon = None
-            self._set_status("停止异常")
-
-    def handle_status(self, text):
-        self.root.after(0, self._set_status, text)
-        self.root.after(0, self.append_log, text)
+            self.root.after(0, self._set_status, "停止异常")
+            self.root.after(
+                0, messagebox.showerror, "停止失败", f"停止守护进程时出错：{e}"
+            )
+
+    def _drain_status(self):
+        """定时批量取走守护线程的状态消息，合并为一次界面刷新"""
+        lines = []
+        try:
+            while True:
+                lines.append(self.daemon.status_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if lines:
+            # 稳态下守护线程会周期性重复同一状态，5 秒内的重复不上屏
+            now = time.monotonic()
+            fresh = []
+            for text in lines:
+                if text == self._last_status and now - self._last_status_ts < 5:
+                    continue
+                self._last_status = text
+                self._last_status_ts = now
+                fresh.append(text)
+            if fresh:
+                # 中间状态在一个刷新周期内不可见，只显示最后一条
+                self._set_status(fresh[-1])
+                self.append_log_batch(fresh)
+        self.root.after(100, self._drain_status)
 
     def _set_window_icon(self):
-        if not os.path.exists(ICON_PATH):
+        if not _ICON_EXISTS:
+            return
+        # Tk 8.6 原生支持 PNG，直接让 Tk 解码，省掉 PIL -> ImageTk 的中转拷贝
+        try:
+            self._icon_img = tk.PhotoImage(file=str(ICON_PATH), master=self.root)
+            self.root.iconphoto(False, self._icon_img)
             return
+        except tk.TclError:
+            pass
+        # Tk 解码失败（如非 PNG 格式）时再走 PIL 兜底
         try:
-            img = Image.open(ICON_PATH)
-            self._icon_img = ImageTk.PhotoImage(img)
+            self._icon_img = _get_window_photo(self.root)
             self.root.iconphoto(False, self._icon_img)
         except Exception:
             pass
@@ -439,37 +699,31 @@ class App:
         self.status_var.set(text)
 
     def append_log(self, text):
-        self.log_text.configure(state=tk.NORMAL)
-        self.log_text.insert(tk.END, text + "\n")
-        self.log_text.see(tk.END)
-        self._log_lines += 1
-        if self._log_lines > self._log_limit:
-            self.log_text.delete("1.0", "2.0")
-            self._log_lines -= 1
-        self.log_text.configure(state=tk.DISABLED)
+        self.append_log_batch((text,))
+
+    def append_log_batch(self, lines):
+        """一次插入多行日志，N 条消息只触发一次重绘和滚动"""
+        if self.log_list is None:
+            self._pending_logs.extend(lines)
+            return
+        self.log_list.insert(tk.END, *lines)
+        # 行数由 Listbox 维护；超限 100 行以上才一次性裁掉
+        size = self.log_list.size()
+        if size > self._log_limit + 100:
+            self.log_list.delete(0, size - self._log_limit - 1)
+        # 直接滚到底；see 会先走一次可见性计算，批量插入后没有必要
+        self.log_list.yview_moveto(1.0)
 
     def clear_log(self):
-        self.log_text.configure(state=tk.NORMAL)
-        self.log_text.delete("1.0", tk.END)
-        self.log_text.configure(state=tk.DISABLED)
-        self._log_lines = 0
+        if self.log_list is None:
+            self._pending_logs.clear()
+            return
+        self.log_list.delete(0, tk.END)
 
     def _cleanup_and_exit(self):
         """清理资源并退出程序"""
-        try:
-            if self.daemon and self.daemon.is_alive():
-                self.daemon.stop()
-                # 等待线程结束，最多等待3秒
-                self.daemon.join(timeout=3)
-        except Exception as e:
-            print(f"清理资源时出错: {e}")
-        finally:
-            try:
-                if self.tray_icon:
-                    self.tray_icon.stop()
-            except Exception:
-                pass
-            self.root.destroy()
+        self._shutdown()
+        self.root.destroy()
 
     def hide_to_tray(self):
         """隐藏窗口到托盘（托盘图标已常驻）"""